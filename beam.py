@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from budget import Budget
+from puzzle import Level, Move, WALL, GIRL, LOCK
+from search import Node, SearchResult, Stats, Status
+
+
+BLOCKED_PENALTY = 2
+
+
+@dataclass
+class BeamResult(SearchResult):
+    proven: bool = field(default=True)  # no layer was ever truncated, so the result is the same as an exhaustive bfs
+    width: int = field(default=0)
+
+
+def score(level: Level) -> int:
+    # higher is better: moves to spare, minus the distance still to cover, minus walled-in helltaker
+    blocked = 0
+    for move in Move:
+        square = level[level.helltaker + move.position]
+        if square in (WALL, GIRL) or (square == LOCK and not level.has_key):
+            blocked += 1
+
+    return level.moves - level.distance() - BLOCKED_PENALTY * blocked
+
+
+def _beam_search(level: Level, width: int, budget: Optional[Budget], stats: Stats, start: float) -> BeamResult:
+    # stats and start are shared by all the widening attempts, so expansions (and the budget) add up across them
+    truncated = False
+
+    node = Node(level=level.clone())
+    layer = [node]
+    seen = {node.level}
+    best = node     # top of the last non-empty layer
+
+    def result(status, solution=None, reason=None):
+        stats.explored, stats.frontier, stats.elapsed = len(seen), len(layer), time.monotonic() - start
+        return BeamResult(status, solution=solution, stats=stats, reason=reason, best=best, proven=not truncated,
+                          width=width)
+
+    if node.level.is_goal():
+        return result(Status.SOLVED, node.solution)
+
+    while layer:
+        children = []
+        for node in layer:
+            if budget is not None and (reason := budget.exhausted(stats.expansions, len(seen))):
+                return result(Status.BUDGET_EXHAUSTED, reason=reason)
+            stats.expansions += 1
+
+            for child in node.successors():
+                if child.level in seen:
+                    continue
+                if child.level.is_goal():
+                    return result(Status.SOLVED, child.solution)
+                seen.add(child.level)
+                children.append(child)
+
+        children.sort(key=lambda child: score(child.level), reverse=True)   # stable, so ties keep move order
+        if len(children) > width:
+            truncated = True
+            for child in children[width:]:
+                seen.discard(child.level)   # dropped, so only the kept states count as seen
+            children = children[:width]
+        layer = children
+        if layer:
+            best = layer[0]
+
+    if truncated:
+        return result(Status.BUDGET_EXHAUSTED, reason='width')
+    return result(Status.UNSOLVABLE)
+
+
+def beam_search(level: Level, width=64, max_width=4096, budget: Optional[Budget] = None) -> BeamResult:
+    """
+    Keeps only the best width states (by score) per depth, so memory is O(width * depth).
+    If that finds nothing, but some layer was truncated, retries with double the width, up to max_width.
+    """
+    if width < 1 or max_width < width:
+        raise ValueError(f'need 1 <= width <= max_width, got width={width}, max_width={max_width}')
+
+    start = time.monotonic()
+    stats = Stats()
+    if budget is not None:
+        budget.start()
+
+    while True:
+        result = _beam_search(level, width, budget, stats, start)
+        if result.status != Status.BUDGET_EXHAUSTED or result.reason != 'width' or width >= max_width:
+            return result
+        width = min(width * 2, max_width)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import os
+import resource
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class Budget:
+    """
+    Limits for a search. Expansion and explored-set limits are checked every expansion, the rest (clock, cancel,
+    memory) only every check_every expansions since they cost a syscall.
+    cancel is anything with is_set(), e.g. threading.Event or multiprocessing.Event.
+    """
+    time_limit: Optional[float] = field(default=None)       # seconds
+    max_expansions: Optional[int] = field(default=None)
+    max_explored: Optional[int] = field(default=None)
+    max_rss: Optional[int] = field(default=None)            # bytes, current RSS of the process
+    cancel: Optional[object] = field(default=None)
+    check_every: int = field(default=256)
+
+    _deadline: Optional[float] = field(default=None, init=False, repr=False)
+
+    def start(self) -> None:
+        if self.time_limit is not None:
+            self._deadline = time.monotonic() + self.time_limit
+
+    def exhausted(self, expansions: int, explored: int) -> Optional[str]:
+        """Returns why the budget is exhausted, or None."""
+        if self.max_expansions is not None and expansions >= self.max_expansions:
+            return 'expansions'
+        if self.max_explored is not None and explored >= self.max_explored:
+            return 'explored'
+
+        if expansions % self.check_every:
+            return None
+
+        if self.cancel is not None and self.cancel.is_set():
+            return 'cancelled'
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return 'time'
+        if self.max_rss is not None and rss() >= self.max_rss:
+            return 'memory'
+
+        return None
+
+
+def rss() -> int:
+    # current resident set size - not ru_maxrss, which is the peak and never goes back down
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # no procfs (e.g. macOS), so peak is the best there is; ru_maxrss is in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+from typing import Callable, Optional
+
+from puzzle import Level, Move
+
+
+# what pickle.load can raise on a truncated stream
+_TORN = (EOFError, pickle.UnpicklingError, ValueError, AttributeError, IndexError, struct.error)
+
+
+class Checkpoint:
+    """
+    Append-only search checkpoint.
+
+    The file starts with the pickled (root level, search config), followed by batches of expansion records. Each
+    record is (index of the expanded node, moves of the children pushed onto the frontier, as bytes). Nodes are
+    numbered in the order they're pushed (root is 0), so parent links, the explored set and the frontier can all be
+    rebuilt by replaying the records - one do_move per pushed child, no successor generation or frontier checks.
+    """
+
+    def __init__(self, fpath: str, every: int = 1000):
+        self.fpath = fpath
+        self.every = every
+
+        self.expansions = 0    # replayed by resume
+        self._next_index = 0
+        self._records = []
+
+    def resume(self, level: Level, config: Optional[dict] = None, on_expand: Optional[Callable] = None):
+        """
+        Returns (frontier, explored) as they were at the last checkpoint, or (None, None) if there is no checkpoint
+        file yet, or its header is unreadable (in which case one is started for this level).
+        config is whatever decides the pop order (strategy, move order); resuming with a different one is refused,
+        since the replayed frontier would be popped differently.
+        on_expand(node) is called for every replayed expansion, in the original order.
+        """
+        from search import Node     # search imports this module
+
+        header = self._load_header()
+        if header is None:
+            self._write_header(level, config)
+            return None, None
+
+        with open(self.fpath, 'r+b') as f:
+            root_level, root_config = pickle.load(f)
+            if root_level != level:
+                raise ValueError(f'{self.fpath} is a checkpoint for a different level')
+            if root_config != config:
+                raise ValueError(f'{self.fpath} is a checkpoint for a different search: {root_config}')
+
+            root = Node(level=level.clone(), index=0)
+            frontier = {0: root}   # insertion order is frontier order
+            explored = set()
+            next_index = 1
+            expansions = 0
+
+            for record in self._load_records(f):
+                for index, moves in record:
+                    node = frontier.pop(index)
+                    explored.add(node.level)
+                    expansions += 1
+                    if on_expand is not None:
+                        on_expand(node)
+
+                    for value in moves:
+                        move = Move(value)
+                        child_level = node.level.clone()
+                        child_level.do_move(move)
+                        frontier[next_index] = Node(level=child_level, move=move, parent=node, index=next_index)
+                        next_index += 1
+
+        self.expansions = expansions
+        self._next_index = next_index
+        return list(frontier.values()), explored
+
+    def _load_header(self):
+        # a missing or unreadable header (e.g. from a crash while it was written) means there's nothing to resume
+        try:
+            with open(self.fpath, 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, *_TORN):
+            return None
+
+    def _write_header(self, level: Level, config: Optional[dict]) -> None:
+        # write and fsync a temp file, then rename it in place, so the checkpoint is never left half-written
+        tmp_fpath = f'{self.fpath}.tmp'
+        with open(tmp_fpath, 'wb') as f:
+            pickle.dump((level, config), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_fpath, self.fpath)
+
+    @staticmethod
+    def _load_records(f):
+        while True:
+            end = f.tell()
+            try:
+                yield pickle.load(f)
+            except _TORN:
+                # interrupted while appending - drop the partial batch so new ones aren't appended after it
+                f.truncate(end)
+                return
+
+    def index(self, node) -> None:
+        node.index = self._next_index
+        self._next_index += 1
+
+    def expanded(self, node, children) -> None:
+        self._records.append((node.index, bytes(child.move.value for child in children)))
+        if len(self._records) >= self.every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._records:
+            return
+
+        with open(self.fpath, 'ab') as f:
+            pickle.dump(self._records, f)
+            f.flush()
+            os.fsync(f.fileno())
+        self._records = []
@@ -85,7 +85,7 @@ def level(fpath, search_verbose=False):
     print(level_)
     print()
 
-    # solution = search(level, verbose=True)
+    # solution = search(level, verbose=True).solution
     solution, levels = search1(level_, verbose=search_verbose)
     print(solution)
     print()
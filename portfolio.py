@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+from budget import Budget
+from puzzle import Level, Move, KEY, KEY_UNDER_ROCK, EMPTY
+from search import search, SearchResult, Status
+
+
+@dataclass(frozen=True)
+class Strategy:
+    name: str
+    strategy: str = field(default='dfs')    # search.FRONTIERS key
+    moves: tuple[Move, ...] = field(default=tuple(Move))
+
+
+STRATEGIES = [
+    Strategy('dfs'),
+    Strategy('bfs', strategy='bfs'),
+    Strategy('best', strategy='best'),
+    Strategy('dfs-reversed', moves=tuple(reversed(Move))),
+    Strategy('dfs-vertical', moves=(Move.UP, Move.DOWN, Move.LEFT, Move.RIGHT)),
+]
+
+
+def level_class(level: Level) -> str:
+    # coarse features that seem to decide which strategy wins
+    features = [f'{level.shape[0]}x{level.shape[1]}', f'moves{level.moves // 10 * 10}']
+    if (level.spikes != EMPTY).any():
+        features.append('spikes')
+    if KEY in level.grid or KEY_UNDER_ROCK in level.grid:
+        features.append('key')
+    if level.needs_code:
+        features.append('code')
+
+    return '-'.join(features)
+
+
+def learned_order(record: str, cls: str, strategies: list[Strategy] = STRATEGIES) -> list[Strategy]:
+    """strategies sorted by how often they won on levels of class cls (stable, so ties keep their order)"""
+    wins = Counter()
+    if os.path.exists(record):
+        with open(record) as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['class'] == cls:
+                    wins[entry['winner']] += 1
+
+    return sorted(strategies, key=lambda strategy: -wins[strategy.name])
+
+
+def _run(strategy: Strategy, level: Level, budget: Budget, results: mp.Queue) -> None:
+    result = search(level, budget=budget, strategy=strategy.strategy, moves=strategy.moves)
+    results.put((strategy.name, result))
+
+
+def portfolio(level: Level, strategies: Optional[list[Strategy]] = None, max_workers: Optional[int] = None,
+              budget: Optional[Budget] = None, record: Optional[str] = None, name: Optional[str] = None) \
+        -> (Optional[str], SearchResult):
+    """
+    Races strategies in separate processes and returns (winning strategy name, its result) as soon as one solves
+    the level or proves it unsolvable; the others are cancelled. If every strategy runs out of budget (or budget.cancel
+    is set), returns (None, last result); if they all crash, (None, a FAILED result).
+    Without explicit strategies, STRATEGIES are tried in the order learned from record (a json lines file that
+    winners get appended to, tagged with name and level_class). Every strategy stays in the race, but at most
+    max_workers (default: one per cpu) run at once - the next one starts when a running one gives up.
+    Wins are only recorded when at least two strategies actually ran.
+    """
+    cls = level_class(level)
+    if strategies is None:
+        strategies = learned_order(record, cls) if record is not None else STRATEGIES
+    max_workers = max_workers or os.cpu_count() or 1
+
+    budget = budget or Budget()
+    caller_cancel = budget.cancel   # may not be shareable between processes, so the parent polls it instead
+    deadline = time.monotonic() + budget.time_limit if budget.time_limit is not None else None
+    cancel = mp.Event()
+    budget = replace(budget, cancel=cancel)
+    results = mp.Queue()
+
+    waiting = list(strategies)
+    running = {}    # strategy name -> process
+    started = []
+
+    def launch():
+        while waiting and len(running) < max_workers and not cancel.is_set():
+            strategy = waiting.pop(0)
+            process = mp.Process(target=_run, args=(strategy, level, budget, results), daemon=True)
+            process.start()
+            running[strategy.name] = process
+            started.append(process)
+
+    winner, result = None, None
+    try:
+        launch()
+        while running:
+            if (caller_cancel is not None and caller_cancel.is_set()) or \
+                    (deadline is not None and time.monotonic() >= deadline):
+                cancel.set()    # running workers report BUDGET_EXHAUSTED shortly
+
+            try:
+                winner, result = results.get(timeout=1)
+            except queue.Empty:
+                if results.empty():
+                    for strategy_name, process in list(running.items()):
+                        if not process.is_alive():
+                            del running[strategy_name]    # crashed without a result
+                    launch()
+                continue
+
+            running.pop(winner, None)
+            if result.status != Status.BUDGET_EXHAUSTED:
+                break
+            winner = None
+            launch()
+    finally:
+        cancel.set()
+        for process in started:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    if result is None:
+        result = SearchResult(Status.FAILED, reason='crashed')
+
+    if record is not None and winner is not None and result.status == Status.SOLVED and len(started) >= 2:
+        with open(record, 'a') as f:
+            f.write(json.dumps({'level': name, 'class': cls, 'winner': winner,
+                                'expansions': result.stats.expansions, 'elapsed': result.stats.elapsed}))
+            f.write('\n')
+
+    return winner, result
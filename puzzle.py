@@ -31,6 +31,10 @@ class Position:
     def __add__(self, other):
         return Position(self.row + other.row, self.col + other.col)
 
+    def distance(self, other) -> int:
+        # manhattan
+        return abs(self.row - other.row) + abs(self.col - other.col)
+
 
 MOVES_STR = '←↑→↓'
 POSITIONS = Position(0, -1), Position(-1, 0), Position(0, 1), Position(1, 0)
@@ -378,14 +382,10 @@ class Level:
 
         # update spikes
         # this means spikes need to be compared too, I think
-        for i, row in enumerate(self.spikes):
-            for j, col in enumerate(row):
-                if col == SPIKES_UP:
-                    self.spikes[i][j] = SPIKES_DOWN
-                elif col == SPIKES_DOWN:
-                    self.spikes[i][j] = SPIKES_UP
-                    if self.grid[i][j] == U:
-                        self.grid[i][j] = E
+        up, down = self.spikes == SPIKES_UP, self.spikes == SPIKES_DOWN
+        self.spikes[up] = SPIKES_DOWN
+        self.spikes[down] = SPIKES_UP
+        self.grid[down & (self.grid == U)] = E
 
         self.moves -= 1
 
@@ -401,3 +401,20 @@ class Level:
     def is_terminal(self) -> int:
         return self.moves <= 0 or self.is_goal()
 
+    def distance(self) -> int:
+        # manhattan distance from helltaker to the nearest objective (ignores walls), going through the code first
+        # if it's still needed, or the key if there's a lock in the way
+        pickups = ()
+        if self.needs_code and not self.has_code:
+            pickups = (CODE_UNDER_ROCK, CODE)
+        elif not self.has_key and LOCK in self.grid:
+            pickups = (KEY, KEY_UNDER_ROCK)
+
+        positions = [Position(row, col) for row, col in np.argwhere(np.isin(self.grid, pickups))]
+        if not positions:
+            return min(self.helltaker.distance(objective) for objective in self.objectives)
+
+        return min(self.helltaker.distance(position) +
+                   min(position.distance(objective) for objective in self.objectives)
+                   for position in positions)
+
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+import itertools
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Optional
+from enum import Enum, auto
+from typing import Iterable, Optional
 
+from budget import Budget
+from checkpoint import Checkpoint
 from puzzle import Level, Move, IllegalMove
 
 
@@ -14,6 +20,7 @@ class Node:
     level: Level
     move: Optional[Move] = field(default=None)
     parent: Optional[Node] = field(default=None)
+    index: Optional[int] = field(default=None, compare=False, repr=False)   # set when checkpointing
 
     @property
     def solution(self) -> list[Move]:
@@ -27,8 +34,8 @@ class Node:
 
         return list(reversed(solution))
 
-    def successors(self):
-        for move in Move:
+    def successors(self, moves: Iterable[Move] = Move):
+        for move in moves:
             try:
                 level = self.level.clone()
                 level.do_move(move)
@@ -37,36 +44,176 @@ class Node:
                 pass
 
 
-def search(level: Level, verbose=False):
-    node = Node(level=level.clone())
+class StackFrontier:
+    # depth-first; levels mirrors nodes for membership checks (a level is never pushed twice)
+    def __init__(self, nodes: Iterable[Node] = ()):
+        self.nodes = []
+        self.levels = set()
+        for node in nodes:
+            self.push(node)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, level: Level):
+        return level in self.levels
+
+    def push(self, node: Node) -> None:
+        self.nodes.append(node)
+        self.levels.add(node.level)
+
+    def pop(self) -> Node:
+        node = self.nodes.pop()
+        self.levels.remove(node.level)
+        return node
+
+
+class QueueFrontier(StackFrontier):
+    # breadth-first
+    def __init__(self, nodes: Iterable[Node] = ()):
+        super().__init__()
+        self.nodes = deque()
+        for node in nodes:
+            self.push(node)
+
+    def pop(self) -> Node:
+        node = self.nodes.popleft()
+        self.levels.remove(node.level)
+        return node
+
+
+class PriorityFrontier(StackFrontier):
+    # best-first: closest to an objective, then most moves left, then oldest
+    def __init__(self, nodes: Iterable[Node] = ()):
+        self.counter = itertools.count()
+        super().__init__(nodes)
+
+    def __iter__(self):
+        return (node for *_, node in self.nodes)
+
+    def push(self, node: Node) -> None:
+        heapq.heappush(self.nodes, (node.level.distance(), -node.level.moves, next(self.counter), node))
+        self.levels.add(node.level)
+
+    def pop(self) -> Node:
+        node = heapq.heappop(self.nodes)[-1]
+        self.levels.remove(node.level)
+        return node
+
+
+FRONTIERS = {'dfs': StackFrontier, 'bfs': QueueFrontier, 'best': PriorityFrontier}
+
+
+class Status(Enum):
+    SOLVED = auto()
+    UNSOLVABLE = auto()
+    BUDGET_EXHAUSTED = auto()
+    FAILED = auto()     # the search itself died (e.g. a portfolio worker crashed)
+
+
+@dataclass
+class Stats:
+    expansions: int = field(default=0)
+    explored: int = field(default=0)
+    frontier: int = field(default=0)
+    elapsed: float = field(default=0.0)
 
-    if node.level.is_goal():
-        return node.solution
 
+@dataclass
+class SearchResult:
+    status: Status
+    solution: Optional[list[Move]] = field(default=None)
+    stats: Stats = field(default_factory=Stats)
+    reason: Optional[str] = field(default=None)     # which budget ran out
+    best: Optional[Node] = field(default=None)      # closest to an objective so far, if keep_best
+
+
+def _resume(checkpoint: Optional[Checkpoint], node: Node, frontier, explored, strategy='dfs',
+            moves: tuple[Move, ...] = tuple(Move), on_expand=None):
+    if checkpoint is None:
+        return frontier, explored
+
+    config = {'strategy': strategy, 'moves': [move.value for move in moves]}
+    resumed_frontier, resumed_explored = checkpoint.resume(node.level, config=config, on_expand=on_expand)
+    if resumed_frontier is None:
+        checkpoint.index(node)
+        return frontier, explored
+
+    return resumed_frontier, resumed_explored
+
+
+def _checkpoint(checkpoint: Optional[Checkpoint], node: Node, children: list[Node]) -> None:
+    if checkpoint is None:
+        return
+
+    for child in children:
+        checkpoint.index(child)
+    checkpoint.expanded(node, children)
+
+
+def search(level: Level, verbose=False, checkpoint: Optional[Checkpoint] = None, budget: Optional[Budget] = None,
+           keep_best=False, strategy='dfs', moves: Iterable[Move] = Move) -> SearchResult:
+    """strategy is a FRONTIERS key, moves is the order successors are generated in."""
+    start = time.monotonic()
+    stats = Stats()
+
+    def result(status, solution=None, reason=None):
+        if checkpoint is not None:
+            checkpoint.flush()
+        stats.explored, stats.frontier, stats.elapsed = len(explored), len(frontier), time.monotonic() - start
+        return SearchResult(status, solution=solution, stats=stats, reason=reason, best=best)
+
+    node = Node(level=level.clone())
+    best = node if keep_best else None
+
+    moves = tuple(moves)
     frontier = [node]
     explored = set()
 
+    if node.level.is_goal():
+        return result(Status.SOLVED, node.solution)
+
+    frontier, explored = _resume(checkpoint, node, frontier, explored, strategy=strategy, moves=moves)
+    frontier = FRONTIERS[strategy](frontier)
+    if checkpoint is not None:
+        stats.expansions = checkpoint.expansions
+    if budget is not None:
+        budget.start()
+
     while True:
         if not frontier:
-            return None     # failure
+            return result(Status.UNSOLVABLE)     # failure
+
+        if budget is not None and (reason := budget.exhausted(stats.expansions, len(explored))):
+            return result(Status.BUDGET_EXHAUSTED, reason=reason)
 
         node = frontier.pop()
         if verbose:
             print(node.level)
         explored.add(node.level)
+        stats.expansions += 1
 
-        for child in node.successors():
-            if not(child.level in explored or child.level in [nd.level for nd in frontier]):
+        children = []
+        for child in node.successors(moves):
+            if not(child.level in explored or child.level in frontier):
                 if child.level.is_goal():
                     if verbose:
                         print(child.level)
-                    return child.solution
-                frontier.append(child)
+                    return result(Status.SOLVED, child.solution)
+                frontier.push(child)
+                children.append(child)
+                if keep_best and (child.level.distance(), -child.level.moves) < \
+                        (best.level.distance(), -best.level.moves):
+                    best = child
+        _checkpoint(checkpoint, node, children)
 
     raise Exception     # should never get here
 
 
-def search1(level: Level, verbose=False):
+def search1(level: Level, verbose=False, checkpoint: Optional[Checkpoint] = None):
     levels = defaultdict(list)
 
     node = Node(level=level.clone())
@@ -75,11 +222,18 @@ def search1(level: Level, verbose=False):
     if node.level.is_goal():
         return node.solution, levels
 
+    def on_expand(node_):
+        for child_ in node_.successors():
+            levels[node_.level].append((child_.move, child_.level))
+
     frontier = [node]
     explored = set()
+    frontier, explored = _resume(checkpoint, node, frontier, explored, on_expand=on_expand)
 
     while True:
         if not frontier:
+            if checkpoint is not None:
+                checkpoint.flush()
             return None, levels     # failure
 
         node = frontier.pop()
@@ -88,13 +242,18 @@ def search1(level: Level, verbose=False):
             print(node.level.is_goal(), node.level.is_terminal())
         explored.add(node.level)
 
+        children = []
         for child in node.successors():
             levels[node.level].append((child.move, child.level))
             if not(child.level in explored or child.level in [nd.level for nd in frontier]):
                 if child.level.is_goal():
                     if verbose:
                         print(child.level)
+                    if checkpoint is not None:
+                        checkpoint.flush()
                     return child.solution, levels
                 frontier.append(child)
+                children.append(child)
+        _checkpoint(checkpoint, node, children)
 
     raise Exception     # should never get here
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from puzzle import Level, Move, MOVES_STR, IllegalMove
+
+
+@dataclass
+class Verification:
+    fpath: str
+    solution: str
+    solved: bool
+    step: Optional[int] = field(default=None)      # index of the first failing move (number of moves if none failed)
+    reason: Optional[str] = field(default=None)
+
+    def __str__(self):
+        if self.solved:
+            return f'{self.fpath}: ok'
+        if self.step is None:
+            return f'{self.fpath}: {self.reason}'
+        return f'{self.fpath}: step {self.step}: {self.reason}'
+
+
+def parse_solution(solution: str) -> list[Move]:
+    """Inverse of main.compress_solution's string form, e.g. '1→ 9↑ 2←'."""
+    moves = []
+
+    for token in solution.split():
+        num, arrow = token[:-1], token[-1]
+        if not num.isdigit() or arrow not in MOVES_STR:
+            raise ValueError(f'bad move {token!r}')
+        moves.extend([Move(MOVES_STR.index(arrow))] * int(num))
+
+    return moves
+
+
+def verify(level: Level, moves: list[Move]) -> (bool, int, Optional[str]):
+    """Replays moves on level (in place). Returns (solved, step, reason) - see Verification."""
+    for step, move in enumerate(moves):
+        if level.is_goal():
+            return False, step, 'moves after goal'
+        if level.moves <= 0:
+            return False, step, 'out of moves'
+        try:
+            level.do_move(move)
+        except IllegalMove as e:
+            return False, step, f'illegal {move!r}: {e}'
+
+    if not level.is_goal():
+        return False, len(moves), 'goal not reached' if level.moves > 0 else 'out of moves'
+
+    return True, len(moves), None
+
+
+def _verify_level(fpath: str, solutions: list[str]) -> list[Verification]:
+    try:
+        initial_level = Level.load(fpath)
+    except (OSError, ValueError, AssertionError, NotImplementedError) as e:
+        # a broken level fails its own solutions, not the whole batch
+        reason = f'cannot load level: {e!r}'
+        return [Verification(fpath, solution, False, None, reason) for solution in solutions]
+
+    results = []
+    for solution in solutions:
+        try:
+            moves = parse_solution(solution)
+        except ValueError as e:
+            results.append(Verification(fpath, solution, False, 0, str(e)))
+            continue
+
+        solved, step, reason = verify(initial_level.clone(), moves)
+        results.append(Verification(fpath, solution, solved, step, reason))
+
+    return results
+
+
+def verify_all(pairs: list[tuple[str, str]], max_workers: Optional[int] = None) -> list[Verification]:
+    """Verifies (level fpath, solution string) pairs, one worker task per level. Results are in input order."""
+    by_level = defaultdict(list)
+    for i, (fpath, solution) in enumerate(pairs):
+        by_level[fpath].append((i, solution))
+
+    results = [None] * len(pairs)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {fpath: executor.submit(_verify_level, fpath, [solution for _, solution in items])
+                   for fpath, items in by_level.items()}
+        for fpath, future in futures.items():
+            for (i, _), result in zip(by_level[fpath], future.result()):
+                results[i] = result
+
+    return results
+
+
+def main():
+    # one "<level fpath>\t<solution>" per line, e.g. "levels/level8.txt\t1→ 9↑ 2←"
+    pairs, malformed = [], []
+    for line_num, line in enumerate(sys.stdin, 1):
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+        if '\t' not in line:
+            reason = 'expected "<level fpath>\\t<solution>"'
+            malformed.append(Verification(f'line {line_num}', line, False, None, reason))
+            continue
+        pairs.append(tuple(line.split('\t', 1)))
+
+    results = malformed + verify_all(pairs)
+    failed = [result for result in results if not result.solved]
+    for result in failed:
+        print(result)
+    print(f'{len(results) - len(failed)}/{len(results)} ok')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())